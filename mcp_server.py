@@ -5,8 +5,8 @@ Wraps the virality detector functionality as an MCP tool
 """
 
 import os
-import json
 import asyncio
+import orjson
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp import types
@@ -19,7 +19,7 @@ _spec = importlib.util.spec_from_file_location("youtube_virality_detector",
 _module = importlib.util.module_from_spec(_spec)
 _sys.modules["youtube_virality_detector"] = _module
 _spec.loader.exec_module(_module)
-from youtube_virality_detector import ViralityDetector
+from youtube_virality_detector import ViralityDetector, close_openai_clients
 
 
 # Create MCP server instance
@@ -73,7 +73,7 @@ async def call_tool(name: str, arguments: dict) -> list[types.TextContent]:
     if not url:
         return [types.TextContent(
             type="text",
-            text=json.dumps({"error": "URL parameter is required"})
+            text=orjson.dumps({"error": "URL parameter is required"}).decode()
         )]
 
     # Get OpenAI API key from environment
@@ -81,25 +81,22 @@ async def call_tool(name: str, arguments: dict) -> list[types.TextContent]:
     if not api_key:
         return [types.TextContent(
             type="text",
-            text=json.dumps({
+            text=orjson.dumps({
                 "error": "OPENAI_API_KEY environment variable not set. Please configure it in your MCP settings."
-            })
+            }).decode()
         )]
 
     try:
-        # Initialize detector (blocking operation, but MCP handles this)
+        # Initialize detector
         detector = ViralityDetector(api_key, whisper_model)
 
-        # Process video
-        results = detector.process_video(url)
+        # Process video (download/transcribe run in worker threads, keeping the event loop free).
+        # The full transcript is not requested - it is never part of the tool output.
+        results = await detector.process_video_async(url)
 
         # Limit to requested number of clips
         results["viral_moments"] = results["viral_moments"][:max_clips]
 
-        # Remove full transcript to reduce output size
-        if "full_transcript" in results:
-            del results["full_transcript"]
-
         # Format output for better readability
         output = {
             "video_title": results["video"]["title"],
@@ -125,27 +122,33 @@ async def call_tool(name: str, arguments: dict) -> list[types.TextContent]:
 
         return [types.TextContent(
             type="text",
-            text=json.dumps(output, indent=2)
+            # Compact, single pass: MCP returns the whole result in one message (no
+            # incremental delivery), and indentation only adds bytes/tokens for the client
+            text=orjson.dumps(output).decode()
         )]
 
     except Exception as e:
         return [types.TextContent(
             type="text",
-            text=json.dumps({
+            text=orjson.dumps({
                 "error": f"Failed to process video: {str(e)}",
                 "url": url
-            })
+            }).decode()
         )]
 
 
 async def main():
     """Run the MCP server"""
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            app.create_initialization_options()
-        )
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await app.run(
+                read_stream,
+                write_stream,
+                app.create_initialization_options()
+            )
+    finally:
+        # Release the shared OpenAI connection pools
+        await close_openai_clients()
 
 
 if __name__ == "__main__":
@@ -5,13 +5,18 @@ Analyzes YouTube videos to identify high-virality moments using transcription an
 """
 
 import os
-import json
+import time
+import hashlib
+import asyncio
+import contextlib
 import argparse
+import functools
 import logging
+import threading
+import weakref
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Iterator, Optional, Tuple, Union
 from dataclasses import dataclass, asdict
-from datetime import timedelta
 import tempfile
 import subprocess
 import sys
@@ -19,21 +24,16 @@ import sys
 # Third-party imports
 try:
     import yt_dlp
-    from openai import OpenAI
+    import numpy as np
+    import httpx
+    import orjson
+    from openai import OpenAI, AsyncOpenAI, APIConnectionError, DefaultAsyncHttpxClient
     from tqdm import tqdm
 except ImportError as e:
     print(f"Missing dependency: {e}")
-    print("Install with: pip install yt-dlp openai tqdm")
+    print("Install with: pip install yt-dlp numpy orjson openai tqdm")
     sys.exit(1)
 
-# Optional: local whisper for fallback (if API fails or file >25MB)
-try:
-    import whisper
-    HAS_LOCAL_WHISPER = True
-except ImportError:
-    HAS_LOCAL_WHISPER = False
-    logger.warning("Local whisper not installed - will only use API (install with: pip install openai-whisper)")
-
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -41,22 +41,291 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Whisper models consume 16 kHz mono audio
+WHISPER_SAMPLE_RATE = 16000
+
+# Approximate size of the 'worstaudio' opus/m4a streams YouTubeDownloader fetches (~48 kbps)
+_DOWNLOADED_AUDIO_BYTES_PER_S = 48_000 / 8
+
+# Optional: local faster-whisper for fallback (if API fails or file >25MB)
+try:
+    import ctranslate2
+    from faster_whisper import WhisperModel, BatchedInferencePipeline
+    HAS_LOCAL_WHISPER = True
+except ImportError:
+    HAS_LOCAL_WHISPER = False
+    logger.warning("Local faster-whisper not installed - will only use API (install with: pip install faster-whisper)")
+
+
+# Static CLEAR-framework instructions, sent verbatim as the system message on
+# every call. Nothing request-specific may be interpolated here: OpenAI's prompt
+# cache only matches identical prefixes, so video info and transcript go last.
+_CLEAR_SYSTEM_PROMPT = """You are a viral video clip expert helping content creators identify high-performing short-form content from long-form videos.
+
+=== CLARITY ===
+Problem: Extract 3-4 viral-worthy clips from this YouTube video that will perform on TikTok, Reels, and Shorts.
+
+Video context (title, channel, duration) is given at the top of the user message.
+
+Objective: Identify clips with 0.75+ virality scores that capture COMPLETE thoughts/stories.
+
+Scope:
+✅ IN: Self-contained moments with natural beginning/end, complete narrative arcs, full back-and-forths
+❌ OUT: Mid-sentence cuts, incomplete thoughts, clips requiring prior context
+
+=== LOGIC ===
+Clip Selection Process:
+1) Scan transcript for high-energy moments (hooks, punchlines, reveals, reactions)
+2) Expand boundaries to capture COMPLETE thought (30-60 seconds optimal, 25-65 acceptable)
+3) Ensure clip starts at natural sentence/idea beginning and ends at natural conclusion
+4) Verify clip is self-contained (understandable without watching full video)
+5) Assign virality score based on emotional impact + shareability + completeness
+
+Decision Rules:
+- NEVER cut mid-sentence or mid-thought
+- If punchline exists, MUST include full setup + delivery
+- If dialogue/exchange, capture BOTH sides completely
+- Prefer natural pauses/transitions as boundaries
+- Clips must not overlap
+
+=== EXAMPLES ===
+✅ "What happened was he was starting a private equity fund..." [35s] - Full story arc: setup → brands → conclusion
+✅ "At the end of all these events he would say..." [30s] - Complete concept with context + definition
+❌ Starting with "...and that's why" (missing context)
+❌ Ending mid-explanation "So basically you need to..." (incomplete)
+
+=== ADAPTATION ===
+If a clip feels incomplete, extend 5-10s in the needed direction; if it runs past 65s, trim to the core moment.
+
+=== RESULTS ===
+For each viral moment return:
+- start_time / end_time: float seconds at natural sentence boundaries
+- hook: 8-12 word catchy title capturing the moment
+- virality_score: 0.0-1.0 (0.3 emotional impact, 0.3 shareability, 0.2 completeness, 0.2 platform fit)
+- reasoning: 2-3 sentences - WHY viral + WHAT makes it complete + WHERE it fits
+- transcript_excerpt: first 10-15 words of the clip
+
+The user message contains the video context followed by the TRANSCRIPT WITH TIMESTAMPS:
+"""
+
+
+# Process-wide caches so repeated detectors (one per MCP tool call) reuse loaded
+# Whisper weights and OpenAI clients instead of rebuilding them per request
+_WHISPER_MODELS: Dict[str, "WhisperModel"] = {}
+_WHISPER_MODEL_LOCKS: Dict[str, threading.Lock] = {}
+_WHISPER_MODELS_LOCK = threading.Lock()  # guards _WHISPER_MODEL_LOCKS only, never held while loading
+_OPENAI_CLIENTS: Dict[str, "OpenAI"] = {}
+_OPENAI_CLIENTS_LOCK = threading.Lock()  # guards _OPENAI_CLIENTS, _OPENAI_CLIENT_USES and _RETIRED_OPENAI_CLIENTS
+
+# In-flight use counts per client (sync and async). A client dropped after a
+# connection error is retired and closed as soon as its last in-flight call ends.
+_OPENAI_CLIENT_USES: Dict[object, int] = {}
+_RETIRED_OPENAI_CLIENTS: set = set()
+
+# Async clients own an httpx pool bound to the event loop that first used it, so
+# they are cached per loop: each asyncio.run() (sync process_video) gets its own
+_ASYNC_OPENAI_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, AsyncOpenAI]]" = weakref.WeakKeyDictionary()
+
+# Explicit pool for the shared async client: concurrent analysis windows and tool
+# calls multiplex over one keep-alive pool instead of exhausting the default limits
+_OPENAI_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+_OPENAI_TIMEOUT_S = 60.0
+
+
+def _acquire_openai_client(client):
+    """Record one more in-flight call on client. Caller holds _OPENAI_CLIENTS_LOCK."""
+    _OPENAI_CLIENT_USES[client] = _OPENAI_CLIENT_USES.get(client, 0) + 1
+
+
+def _release_openai_client(client) -> bool:
+    """Record the end of an in-flight call; True if client is retired and now unused (close it)."""
+    with _OPENAI_CLIENTS_LOCK:
+        uses = _OPENAI_CLIENT_USES[client] - 1
+        if uses:
+            _OPENAI_CLIENT_USES[client] = uses
+            return False
+        del _OPENAI_CLIENT_USES[client]
+        if client in _RETIRED_OPENAI_CLIENTS:
+            _RETIRED_OPENAI_CLIENTS.discard(client)
+            return True
+        return False
+
+
+def _retire_openai_client(client) -> bool:
+    """Mark a dropped client for closing; True if it is already unused (close it now). Caller holds the lock."""
+    if _OPENAI_CLIENT_USES.get(client):
+        _RETIRED_OPENAI_CLIENTS.add(client)
+        return False
+    return True
+
+
+@contextlib.contextmanager
+def _use_openai_client(api_key: str) -> Iterator["OpenAI"]:
+    """Borrow the cached sync OpenAI client for this API key, creating it on first use."""
+    with _OPENAI_CLIENTS_LOCK:
+        client = _OPENAI_CLIENTS.get(api_key)
+        if client is None:
+            client = _OPENAI_CLIENTS[api_key] = OpenAI(api_key=api_key)
+        _acquire_openai_client(client)
+    try:
+        yield client
+    finally:
+        if _release_openai_client(client):
+            client.close()
+
+
+def _drop_openai_client(api_key: str, client: "OpenAI"):
+    """Stop handing out a broken sync client; it is closed once no other thread is using it."""
+    with _OPENAI_CLIENTS_LOCK:
+        if _OPENAI_CLIENTS.get(api_key) is not client:
+            return
+        del _OPENAI_CLIENTS[api_key]
+        close_now = _retire_openai_client(client)
+    if close_now:
+        client.close()
+
+
+@contextlib.asynccontextmanager
+async def _use_async_openai_client(api_key: str):
+    """Borrow the AsyncOpenAI client for this API key on the running event loop, creating it on first use."""
+    clients = _ASYNC_OPENAI_CLIENTS.setdefault(asyncio.get_running_loop(), {})
+    with _OPENAI_CLIENTS_LOCK:
+        client = clients.get(api_key)
+        if client is None:
+            client = clients[api_key] = AsyncOpenAI(
+                api_key=api_key,
+                http_client=DefaultAsyncHttpxClient(limits=_OPENAI_HTTP_LIMITS, timeout=_OPENAI_TIMEOUT_S),
+            )
+        _acquire_openai_client(client)
+    try:
+        yield client
+    finally:
+        if _release_openai_client(client):
+            await client.close()
+
+
+async def _drop_async_openai_client(api_key: str, client: "AsyncOpenAI"):
+    """Stop handing out a broken async client; it is closed once no other coroutine is using it."""
+    clients = _ASYNC_OPENAI_CLIENTS.get(asyncio.get_running_loop(), {})
+    with _OPENAI_CLIENTS_LOCK:
+        if clients.get(api_key) is not client:
+            return
+        del clients[api_key]
+        close_now = _retire_openai_client(client)
+    if close_now:
+        await client.close()
+
+
+async def close_openai_clients():
+    """
+    Close the cached sync clients and the async clients bound to the running
+    event loop, with their connection pools (call at shutdown / end of asyncio.run).
+    """
+    with _OPENAI_CLIENTS_LOCK:
+        clients = list(_OPENAI_CLIENTS.values())
+        clients += [client for client in _RETIRED_OPENAI_CLIENTS if isinstance(client, OpenAI)]
+        _OPENAI_CLIENTS.clear()
+        _RETIRED_OPENAI_CLIENTS.difference_update(clients)
+        async_clients = list(_ASYNC_OPENAI_CLIENTS.pop(asyncio.get_running_loop(), {}).values())
+    for client in clients:
+        client.close()
+    for client in async_clients:
+        await client.close()
+
+
+# Strict structured-output schema for the analysis response: the API guarantees
+# replies conform to it, so every field below is always present
+_VIRAL_MOMENTS_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "viral_moments",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "viral_moments": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "start_time": {"type": "number"},
+                            "end_time": {"type": "number"},
+                            "hook": {"type": "string"},
+                            "virality_score": {"type": "number"},
+                            "reasoning": {"type": "string"},
+                            "transcript_excerpt": {"type": "string"},
+                        },
+                        "required": ["start_time", "end_time", "hook", "virality_score",
+                                     "reasoning", "transcript_excerpt"],
+                        "additionalProperties": False,
+                    },
+                },
+            },
+            "required": ["viral_moments"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+# Folded into analysis cache keys so entries produced under an older prompt or
+# response format are never served after either changes
+_ANALYSIS_CACHE_VERSION = hashlib.sha256(
+    _CLEAR_SYSTEM_PROMPT.encode() + orjson.dumps(_VIRAL_MOMENTS_RESPONSE_FORMAT, option=orjson.OPT_SORT_KEYS)
+).hexdigest()
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_whole_seconds(seconds: int) -> str:
+    """Format whole seconds as H:MM:SS (cached - timestamps repeat across segment boundaries)."""
+    hours, rem = divmod(seconds, 3600)
+    minutes, secs = divmod(rem, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}"
+
+
+class Transcript:
+    """
+    Timed transcript stored as parallel arrays (struct-of-arrays).
+
+    Keeps one float array of segment starts, one of ends and a plain list of
+    texts instead of an object per segment, so range queries
+    are vectorized and formatting loops avoid per-object attribute lookups.
+
+    ``lines`` holds each segment pre-formatted as "[start - end] text" for the
+    analysis prompt, so overlapping analysis windows never re-format a segment.
+    """
+
+    def __init__(self, starts: "np.ndarray", ends: "np.ndarray", texts: List[str], lines: List[str]):
+        self.starts = starts
+        self.ends = ends
+        self.texts = texts
+        self.lines = lines
+
+    @classmethod
+    def from_segments(cls, segments) -> "Transcript":
+        """Build from any iterable of objects with text/start/end attributes (API or faster-whisper segments)."""
+        starts, ends, texts, lines = [], [], [], []
+        for segment in segments:
+            text = segment.text.strip()
+            starts.append(segment.start)
+            ends.append(segment.end)
+            texts.append(text)
+            lines.append(cls._format_line(segment.start, segment.end, text))
+        return cls(np.array(starts, dtype=np.float64), np.array(ends, dtype=np.float64), texts, lines)
 
-@dataclass
-class TranscriptSegment:
-    """Represents a transcribed segment with timing information."""
-    text: str
-    start: float
-    end: float
-    
-    def to_timestamp(self) -> str:
-        """Convert seconds to readable timestamp format."""
-        return f"{self._seconds_to_time(self.start)} - {self._seconds_to_time(self.end)}"
-    
     @staticmethod
-    def _seconds_to_time(seconds: float) -> str:
-        """Convert seconds to HH:MM:SS format."""
-        return str(timedelta(seconds=int(seconds)))
+    def _format_line(start: float, end: float, text: str) -> str:
+        """Format one segment as a timestamped transcript line."""
+        return f"[{start:.1f}s - {end:.1f}s] {text}"
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __getitem__(self, index: slice) -> "Transcript":
+        """Slice into a view sharing the underlying arrays (only slices are supported)."""
+        if not isinstance(index, slice):
+            raise TypeError(f"Transcript indices must be slices, not {type(index).__name__}")
+        return Transcript(self.starts[index], self.ends[index], self.texts[index], self.lines[index])
 
 
 @dataclass
@@ -71,7 +340,7 @@ class ViralMoment:
     
     def to_timestamp(self) -> str:
         """Convert to readable timestamp range."""
-        return f"{TranscriptSegment._seconds_to_time(self.start_time)} - {TranscriptSegment._seconds_to_time(self.end_time)}"
+        return f"{_format_whole_seconds(int(self.start_time))} - {_format_whole_seconds(int(self.end_time))}"
 
 
 class YouTubeDownloader:
@@ -87,14 +356,11 @@ class YouTubeDownloader:
 
         output_path = self.output_dir / "%(title)s.%(ext)s"
 
-        # Optimized settings for fastest download (lower quality is fine for transcription)
+        # Optimized settings for fastest download (lower quality is fine for transcription).
+        # No FFmpegExtractAudio re-encode: the native opus/m4a stream is kept as-is,
+        # since both the Whisper API and faster-whisper decode it directly.
         ydl_opts = {
             'format': 'worstaudio/worst',  # Fastest download - quality doesn't matter for transcription
-            'postprocessors': [{
-                'key': 'FFmpegExtractAudio',
-                'preferredcodec': 'mp3',
-                'preferredquality': '64',  # Lower quality = faster download & smaller file
-            }],
             'outtmpl': str(output_path),
             'quiet': True,
             'no_warnings': True,
@@ -103,13 +369,49 @@ class YouTubeDownloader:
         
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
             info = ydl.extract_info(url, download=True)
-            video_title = info['title']
-            # Get the actual downloaded file path
-            audio_file = self.output_dir / f"{video_title}.mp3"
+            # Get the actual downloaded file path (container extension varies: webm, m4a, ...)
+            audio_file = Path(ydl.prepare_filename(info))
             
         logger.info(f"Audio downloaded: {audio_file}")
         return audio_file, info
 
+    def stream_audio(self, url: str) -> Tuple["np.ndarray", Dict]:
+        """
+        Decode audio straight from YouTube into memory, without writing a file.
+
+        yt-dlp only resolves the direct stream URL; ffmpeg reads it and pipes raw
+        16 kHz mono PCM back, which is returned in the float32 [-1, 1] form Whisper expects.
+
+        Args:
+            url: YouTube video URL
+
+        Returns:
+            Tuple of (audio samples, video info)
+        """
+        logger.info(f"Streaming audio from: {url}")
+
+        ydl_opts = {
+            'format': 'worstaudio/worst',  # Fastest download - quality doesn't matter for transcription
+            'quiet': True,
+            'no_warnings': True,
+        }
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info = ydl.extract_info(url, download=False)
+
+        cmd = ["ffmpeg", "-nostdin", "-loglevel", "error"]
+        headers = "".join(f"{key}: {value}\r\n" for key, value in info.get("http_headers", {}).items())
+        if headers:
+            cmd += ["-headers", headers]
+        cmd += ["-i", info["url"], "-f", "s16le", "-ar", str(WHISPER_SAMPLE_RATE), "-ac", "1", "-"]
+
+        proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if proc.returncode != 0:
+            raise RuntimeError(f"ffmpeg audio decode failed: {proc.stderr.decode(errors='replace').strip()}")
+
+        audio = np.frombuffer(proc.stdout, np.int16).astype(np.float32) / 32768.0
+        logger.info(f"Audio streamed: {len(audio) / WHISPER_SAMPLE_RATE:.0f} seconds")
+        return audio, info
+
 
 class WhisperTranscriber:
     """Handles audio transcription using OpenAI Whisper API (10x faster than local)."""
@@ -120,12 +422,15 @@ class WhisperTranscriber:
 
         Args:
             api_key: OpenAI API key
-            model_size: Kept for compatibility but ignored (API uses whisper-1 model)
+            model_size: Local faster-whisper model used by the fallback path (API uses whisper-1 model)
         """
         logger.info(f"Initializing Whisper API client (using whisper-1 model)")
-        self.client = OpenAI(api_key=api_key)
+        self.api_key = api_key
+        self.model_size = model_size
+        self.model = None
+        self.batched = None
 
-    def transcribe(self, audio_path: Path) -> List[TranscriptSegment]:
+    def transcribe(self, audio_path: Path) -> Transcript:
         """
         Transcribe audio file with timestamps using OpenAI Whisper API.
 
@@ -133,229 +438,492 @@ class WhisperTranscriber:
             audio_path: Path to audio file
 
         Returns:
-            List of TranscriptSegment objects
+            Transcript with segment timings and text
+        """
+        transcript = self._transcribe_api(audio_path)
+        if transcript is None:
+            transcript = self._transcribe_local_fallback(audio_path)
+        return transcript
+
+    async def transcribe_async(self, audio_path: Path) -> Transcript:
+        """
+        Async transcribe(): the API call runs in a worker thread and the local
+        fallback is queued on the shared TranscribeScheduler.
+
+        Args:
+            audio_path: Path to audio file
+
+        Returns:
+            Transcript with segment timings and text
         """
+        transcript = await asyncio.to_thread(self._transcribe_api, audio_path)
+        if transcript is None:
+            logger.info("Using local faster-whisper model (fallback)")
+            transcript = await self.transcribe_local_async(audio_path)
+        return transcript
+
+    def _transcribe_api(self, audio_path: Path) -> Optional[Transcript]:
+        """Transcribe via the Whisper API; None if the file is too large or the call fails."""
         logger.info(f"Transcribing via OpenAI API: {audio_path}")
 
         # API has 25MB file size limit, check before uploading
         file_size_mb = audio_path.stat().st_size / (1024 * 1024)
         if file_size_mb > 25:
             logger.warning(f"File size {file_size_mb:.1f}MB exceeds 25MB limit, using local fallback")
-            return self._transcribe_local_fallback(audio_path)
+            return None
 
+        client = None
         try:
-            with open(audio_path, 'rb') as audio_file:
-                response = self.client.audio.transcriptions.create(
+            with _use_openai_client(self.api_key) as client, open(audio_path, 'rb') as audio_file:
+                response = client.audio.transcriptions.create(
                     model="whisper-1",
                     file=audio_file,
                     response_format="verbose_json",
                     timestamp_granularities=["segment"]
                 )
 
-            # Parse API response into TranscriptSegment objects
-            segments = []
-            for segment in response.segments:
-                segments.append(TranscriptSegment(
-                    text=segment['text'].strip(),
-                    start=segment['start'],
-                    end=segment['end']
-                ))
+            # Parse API response segments into parallel arrays
+            transcript = Transcript.from_segments(response.segments)
 
-            logger.info(f"Transcription complete: {len(segments)} segments")
-            return segments
+            logger.info(f"Transcription complete: {len(transcript)} segments")
+            return transcript
 
         except Exception as e:
+            if isinstance(e, APIConnectionError) and client is not None:
+                _drop_openai_client(self.api_key, client)
             logger.error(f"API transcription failed: {e}, using local fallback")
-            return self._transcribe_local_fallback(audio_path)
+            return None
+
+    def _load_local_model(self):
+        """Lazily load faster-whisper (shared per model size) and wrap it in a batched inference pipeline."""
+        if self.batched is None:
+            if not HAS_LOCAL_WHISPER:
+                raise Exception("Whisper API failed and local faster-whisper is not installed. Install with: pip install faster-whisper")
+
+            # Per-size lock held while loading, so concurrent calls don't load the
+            # same weights twice and a slow download doesn't block other sizes
+            with _WHISPER_MODELS_LOCK:
+                size_lock = _WHISPER_MODEL_LOCKS.setdefault(self.model_size, threading.Lock())
+            with size_lock:
+                model = _WHISPER_MODELS.get(self.model_size)
+                if model is None:
+                    model = _WHISPER_MODELS[self.model_size] = self._create_local_model(self.model_size)
+            self.model = model
+            self.batched = BatchedInferencePipeline(model=self.model)
+        return self.batched
+
+    def _create_local_model(self, model_size: str) -> "WhisperModel":
+        """Load faster-whisper's pre-converted weights for model_size, quantized to int8 on load."""
+        # int8 weights everywhere; GPU keeps float16 activations for tensor cores
+        if ctranslate2.get_cuda_device_count() > 0:
+            compute_type = "int8_float16"
+        else:
+            compute_type = "int8"
+
+        logger.info(f"Loading local faster-whisper model '{model_size}' ({compute_type})")
+        return WhisperModel(model_size, device="auto", compute_type=compute_type)
+
+    def _transcribe_local_fallback(self, audio_path: Path) -> Transcript:
+        """Fallback to local faster-whisper if API fails or file is too large."""
+        logger.info("Using local faster-whisper model (fallback)")
+        return self._transcribe_single(audio_path)
+
+    async def transcribe_local_async(self, audio: Union[Path, "np.ndarray"]) -> Transcript:
+        """
+        Transcribe locally through the shared TranscribeScheduler.
+
+        Concurrent requests are queued onto one worker rather than contending
+        for the GPU from separate threads.
+
+        Args:
+            audio: Audio file path or 16 kHz mono float32 samples
 
-    def _transcribe_local_fallback(self, audio_path: Path) -> List[TranscriptSegment]:
-        """Fallback to local Whisper if API fails or file is too large."""
+        Returns:
+            Transcript with segment timings and text
+        """
+        return await TranscribeScheduler.for_running_loop().submit(self, audio)
+
+    def _transcribe_single(self, audio: Union[Path, "np.ndarray"]) -> Transcript:
+        """Transcribe one audio file or sample array locally, decoding VAD-split speech chunks as a batch."""
+        batched = self._load_local_model()
+        if isinstance(audio, Path):
+            audio = str(audio)
+        # Silero VAD (bundled ONNX model) drops silence/music before the decoder and
+        # segment times are mapped back onto the original timeline
+        result, info = batched.transcribe(audio, batch_size=16, language="en", vad_filter=True)
+        if info.duration:
+            logger.info(f"VAD kept {info.duration_after_vad:.0f}s of {info.duration:.0f}s audio "
+                        f"({info.duration_after_vad / info.duration:.0%})")
+
+        # faster-whisper yields segments lazily - decoding happens while iterating
+        transcript = Transcript.from_segments(result)
+        logger.info(f"Local transcription complete: {len(transcript)} segments")
+        return transcript
+
+
+class TranscribeScheduler:
+    """
+    Pools local transcription requests from concurrent tool calls into one queue.
+
+    Arrivals are collected for up to MAX_WAIT_S (or MAX_BATCH items) and run
+    back-to-back on a single worker thread, shortest audio first so similar
+    durations are adjacent and short requests aren't stuck behind long ones.
+    faster-whisper has no multi-file batch API; each file is already decoded as
+    a GPU batch of its VAD chunks, so serializing files keeps the GPU saturated
+    without concurrent requests competing for it.
+    """
+
+    MAX_BATCH = 16
+    MAX_WAIT_S = 0.1
+
+    _instances: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, TranscribeScheduler]" = weakref.WeakKeyDictionary()
+
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+
+    @classmethod
+    def for_running_loop(cls) -> "TranscribeScheduler":
+        """Return the scheduler bound to the running event loop, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        scheduler = cls._instances.get(loop)
+        if scheduler is None:
+            scheduler = cls._instances[loop] = cls()
+        return scheduler
+
+    async def submit(self, transcriber: "WhisperTranscriber", audio: Union[Path, "np.ndarray"]) -> Transcript:
+        """Queue audio for transcription and wait for its result."""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((transcriber, audio, future))
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        return await future
+
+    async def _run(self):
+        """Drain the queue in batches forever."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.MAX_WAIT_S
+            while len(batch) < self.MAX_BATCH:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await self._run_batch(batch)
+            except BaseException as e:
+                # Never leave a caller waiting forever: fail whatever is still pending
+                for _, _, future in batch:
+                    if not future.done():
+                        if isinstance(e, Exception):
+                            future.set_exception(e)
+                        else:
+                            future.cancel()
+                if not isinstance(e, Exception):
+                    raise
+                logger.error(f"Transcription batch failed: {e}")
+
+    async def _run_batch(self, batch: List[Tuple["WhisperTranscriber", Union[Path, "np.ndarray"], asyncio.Future]]):
+        """Transcribe one batch, shortest estimated duration first."""
+        if len(batch) > 1:
+            logger.info(f"Transcribing batch of {len(batch)} queued requests")
+        batch.sort(key=lambda item: self._audio_duration(item[1]))
+
+        for transcriber, audio, future in batch:
+            if future.done():
+                continue
+            try:
+                result = await asyncio.to_thread(transcriber._transcribe_single, audio)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+
+    @staticmethod
+    def _audio_duration(audio: Union[Path, "np.ndarray"]) -> float:
+        """
+        Estimated duration in seconds, used only to order a batch.
+
+        Sample arrays are exact; files are estimated from size at the bitrate of
+        the low-quality audio streams YouTubeDownloader fetches. An unreadable
+        file sorts first and reports its real error when transcribed.
+        """
+        if isinstance(audio, Path):
+            try:
+                return audio.stat().st_size / _DOWNLOADED_AUDIO_BYTES_PER_S
+            except OSError:
+                return 0.0
+        return len(audio) / WHISPER_SAMPLE_RATE
+
+
+class AnalysisCache:
+    """
+    Persistent on-disk cache of AI analysis results, one JSON file per key.
+
+    Bounded: expired entries are swept when the cache is opened, and each write
+    evicts the oldest entries beyond max_entries. Best-effort: if the cache
+    directory can't be created the cache is disabled and every lookup is a miss.
+    """
+
+    def __init__(self, cache_dir: Path = None, ttl_seconds: float = 7 * 24 * 3600,
+                 max_entries: int = 1000):
+        """
+        Initialize the cache directory.
+
+        Args:
+            cache_dir: Where entries are stored (default: ~/.cache/virality)
+            ttl_seconds: Entries older than this are treated as misses
+            max_entries: Maximum number of stored analyses
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.enabled = True
         try:
-            import whisper
-            logger.info("Using local Whisper model (fallback)")
-            model = whisper.load_model("base")
-            result = model.transcribe(
-                str(audio_path),
-                verbose=False,
-                language="en",
-                task="transcribe"
-            )
+            self.cache_dir = cache_dir or Path.home() / ".cache" / "virality"
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        except (OSError, RuntimeError) as e:
+            logger.warning(f"Analysis cache disabled, cannot create cache directory: {e}")
+            self.enabled = False
+            return
+        self._prune()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached analysis for key, or None if missing or expired."""
+        if not self.enabled:
+            return None
+        path = self.cache_dir / f"{key}.json"
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+                return None
+            return orjson.loads(path.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            return None
+
+    def set(self, key: str, analysis: Dict):
+        """Store an analysis under key (atomic rename, safe across processes)."""
+        if not self.enabled:
+            return
+        path = self.cache_dir / f"{key}.json"
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            tmp_path.write_bytes(orjson.dumps(analysis))
+            tmp_path.replace(path)
+        except OSError as e:
+            logger.warning(f"Failed to write analysis cache: {e}")
+            return
+        self._prune()
+
+    def _prune(self):
+        """Delete expired entries, then the oldest (by mtime) beyond max_entries."""
+        now = time.time()
+        live = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                mtime = path.stat().st_mtime
+                if now - mtime > self.ttl_seconds:
+                    path.unlink(missing_ok=True)
+                else:
+                    live.append((mtime, path))
+            except OSError:
+                continue
 
-            segments = []
-            for segment in result["segments"]:
-                segments.append(TranscriptSegment(
-                    text=segment["text"].strip(),
-                    start=segment["start"],
-                    end=segment["end"]
-                ))
-            return segments
-        except ImportError:
-            raise Exception("Whisper API failed and local whisper is not installed. Install with: pip install openai-whisper")
+        if len(live) > self.max_entries:
+            live.sort()
+            for _, path in live[:len(live) - self.max_entries]:
+                try:
+                    path.unlink(missing_ok=True)
+                except OSError:
+                    continue
 
 
 class ViralityAnalyzer:
     """Analyzes transcript for viral moments using AI."""
     
-    def __init__(self, api_key: str, model: str = "gpt-4-turbo-preview"):
+    # Maximum concurrent chat completion requests, shared by every analysis on an event loop
+    MAX_CONCURRENT_REQUESTS = 5
+
+    # Accepted clip duration range (seconds)
+    MIN_DURATION = 25
+    MAX_DURATION = 65
+
+    _semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+    def __init__(self, api_key: str, model: str = "gpt-4o-mini"):
         """
-        Initialize OpenAI client.
+        Initialize the analyzer (the shared AsyncOpenAI client is resolved per call).
         
         Args:
             api_key: OpenAI API key
             model: Model to use for analysis
         """
-        self.client = OpenAI(api_key=api_key)
+        self.api_key = api_key
         self.model = model
+        self.cache = AnalysisCache()
         
-    def analyze(self, segments: List[TranscriptSegment], video_info: Dict) -> List[ViralMoment]:
+    async def analyze(self, segments: Transcript, video_info: Dict) -> List[ViralMoment]:
         """
         Analyze transcript segments for viral potential.
+
+        Long transcripts are split into overlapping windows that are analyzed
+        concurrently, then merged and re-ranked.
         
         Args:
-            segments: List of transcript segments
+            segments: Transcript to analyze
             video_info: Metadata about the video
             
         Returns:
             List of ViralMoment objects
         """
         logger.info("Analyzing for viral moments...")
-        
+
+        windows = list(self._chunk_segments(segments))
+        if len(windows) > 1:
+            logger.info(f"Transcript split into {len(windows)} windows for concurrent analysis")
+
+        # Bound in-flight requests across all concurrent analyses to respect API rate limits
+        semaphore = self._request_semaphore()
+        results = await asyncio.gather(*[
+            self._analyze_window(window, segments, video_info, semaphore)
+            for window in windows
+        ])
+
+        return self._merge_moments([moment for moments in results for moment in moments])
+
+    @classmethod
+    def _request_semaphore(cls) -> asyncio.Semaphore:
+        """Return the request semaphore bound to the running event loop, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        semaphore = cls._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = cls._semaphores[loop] = asyncio.Semaphore(cls.MAX_CONCURRENT_REQUESTS)
+        return semaphore
+
+    async def _analyze_window(self, window: Transcript, segments: Transcript,
+                              video_info: Dict, semaphore: asyncio.Semaphore) -> List[ViralMoment]:
+        """Run the AI analysis on one transcript window."""
         # Prepare transcript with timestamps
-        transcript_with_times = self._format_transcript(segments)
+        transcript_with_times = self._format_transcript(window)
+
+        # Identical transcripts analyzed by the same model, prompt and schema reuse the stored analysis
+        cache_key = hashlib.sha256(
+            (_ANALYSIS_CACHE_VERSION + "|" + self.model + "|" + transcript_with_times).encode()
+        ).hexdigest()
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            logger.info("Analysis cache hit")
+            return self._parse_viral_moments(cached, segments)
         
         # Create analysis prompt
         prompt = self._create_analysis_prompt(transcript_with_times, video_info)
         
         # Get AI analysis
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": "You are an expert at identifying viral video moments. Analyze transcripts to find highly engaging, shareable moments."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            response_format={"type": "json_object"}
-        )
+        async with semaphore:
+            response = await self._create_completion(prompt)
+
+        message = response.choices[0].message
+        if message.refusal:
+            logger.error(f"AI refused analysis: {message.refusal}")
+            return []
         
-        # Parse response
+        # Parse response (strict schema; decode errors only on truncated output)
         try:
-            analysis = json.loads(response.choices[0].message.content)
+            analysis = orjson.loads(message.content)
+            self.cache.set(cache_key, analysis)
             return self._parse_viral_moments(analysis, segments)
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             logger.error("Failed to parse AI response")
             return []
-    
-    def _format_transcript(self, segments: List[TranscriptSegment]) -> str:
-        """Format transcript with timestamps for analysis."""
-        lines = []
-        for segment in segments:
-            timestamp = f"[{segment.start:.1f}s - {segment.end:.1f}s]"
-            lines.append(f"{timestamp} {segment.text}")
-        return "\n".join(lines)
-    
-    def _create_analysis_prompt(self, transcript: str, video_info: Dict) -> str:
-        """Create the prompt for viral moment analysis using CLEAR framework."""
-        return f"""You are a viral video clip expert helping content creators identify high-performing short-form content from long-form videos.
-
-=== CLARITY ===
-Problem: Extract 3-4 viral-worthy clips from this YouTube video that will perform on TikTok, Reels, and Shorts.
-
-Video Context:
-- Title: {video_info.get('title', 'Unknown')}
-- Channel: {video_info.get('channel', 'Unknown')}
-- Duration: {video_info.get('duration', 0)} seconds
 
-Objective: Identify clips with 0.75+ virality scores that capture COMPLETE thoughts/stories.
-
-Scope:
-✅ IN: Self-contained moments with natural beginning/end, complete narrative arcs, full back-and-forths
-❌ OUT: Mid-sentence cuts, incomplete thoughts, clips requiring prior context
-
-=== LOGIC ===
-Clip Selection Process:
-1) Scan transcript for high-energy moments (hooks, punchlines, reveals, reactions)
-2) Expand boundaries to capture COMPLETE thought (30-60 seconds optimal, 25-65 acceptable)
-3) Ensure clip starts at natural sentence/idea beginning and ends at natural conclusion
-4) Verify clip is self-contained (understandable without watching full video)
-5) Assign virality score based on emotional impact + shareability + completeness
-
-Decision Rules:
-- Duration: 30-60s target (25-65s acceptable range)
-- NEVER cut mid-sentence or mid-thought
-- If punchline exists, MUST include full setup + delivery
-- If dialogue/exchange, capture BOTH sides completely
-- Prefer natural pauses/transitions as boundaries
-
-=== EXAMPLES ===
+    async def _create_completion(self, prompt: str):
+        """Request the analysis, rebuilding the shared client once if its connection is broken."""
+        request = dict(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": _CLEAR_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            response_format=_VIRAL_MOMENTS_RESPONSE_FORMAT
+        )
+        async with _use_async_openai_client(self.api_key) as client:
+            try:
+                return await client.chat.completions.create(**request)
+            except APIConnectionError as e:
+                logger.warning(f"OpenAI connection error ({e}), retrying with a fresh client")
+                broken = client
+        await _drop_async_openai_client(self.api_key, broken)
+        async with _use_async_openai_client(self.api_key) as client:
+            return await client.chat.completions.create(**request)
 
-POSITIVE Examples (from successful viral clips):
-✅ "So one of the first thing according to the SEC..." [40s] - Complete accusation explanation + personal take
-✅ "What happened was he was starting a private equity fund..." [35s] - Full story arc: setup → brands → conclusion
-✅ "At the end of all these events he would say..." [30s] - Complete concept with context + definition
+    @staticmethod
+    def _chunk_segments(segments: Transcript, window_s: float = 600,
+                        overlap_s: float = MAX_DURATION) -> Iterator[Transcript]:
+        """
+        Yield overlapping time windows of segments (~10 minutes each by default).
 
-EDGE CASES:
-- Fast-paced dialogue: Ensure both question AND answer included
-- Multi-part stories: Capture one complete chapter, not fragments
-- Technical explanations: Include setup + explanation + implication
+        Windows overlap by the longest accepted clip, so any valid clip lies
+        entirely inside at least one window.
+        """
+        if not len(segments):
+            return
 
-COUNTEREXAMPLE (what NOT to do):
-❌ Starting with "...and that's why" (missing context)
-❌ Ending mid-explanation "So basically you need to..." (incomplete)
-❌ Cutting off punchline or response in dialogue
+        window_start = float(segments.starts[0])
+        last_end = float(segments.ends[-1])
+        while True:
+            window_end = window_start + window_s
+            # Segments with end > window_start and start < window_end
+            lo = int(np.searchsorted(segments.ends, window_start, side="right"))
+            hi = int(np.searchsorted(segments.starts, window_end, side="left"))
+            if hi > lo:
+                yield segments[lo:hi]
+            if window_end >= last_end:
+                break
+            window_start += window_s - overlap_s
 
-=== ADAPTATION ===
-Quality Check Protocol:
-- Read clip transcript aloud - does it make sense standalone?
-- Check boundaries - natural pause at start/end?
-- Verify duration - 30-60s sweet spot achieved?
-- If clip feels incomplete, extend 5-10s in needed direction
+    @staticmethod
+    def _merge_moments(moments: List[ViralMoment], iou_threshold: float = 0.5) -> List[ViralMoment]:
+        """Drop moments overlapping a higher-scored one by IoU > threshold, sorted by virality score."""
+        merged = []
+        for moment in sorted(moments, key=lambda x: x.virality_score, reverse=True):
+            if all(ViralityAnalyzer._iou(moment, kept) <= iou_threshold for kept in merged):
+                merged.append(moment)
+        return merged
 
-=== RESULTS ===
-Return JSON with this EXACT structure:
-{{
-    "viral_moments": [
-        {{
-            "start_time": <float seconds - find natural sentence start>,
-            "end_time": <float seconds - find natural sentence end>,
-            "hook": "<8-12 word catchy title capturing the moment>",
-            "virality_score": <0.0-1.0 based on: 0.3=emotional impact, 0.3=shareability, 0.2=completeness, 0.2=platform fit>,
-            "reasoning": "<2-3 sentences: WHY viral + WHAT makes it complete + WHERE it fits>",
-            "transcript_excerpt": "<first 10-15 words to verify clip content>"
-        }}
-    ]
-}}
-
-TRANSCRIPT WITH TIMESTAMPS:
-{transcript}
-
-SUCCESS CRITERIA:
-✅ 3-4 clips total
-✅ Each 30-60 seconds (strict: no <25s or >65s)
-✅ Each starts/ends at sentence boundaries
-✅ Each self-contained (test: "Can viewer understand without context?")
-✅ Highest virality score moments prioritized
-✅ No overlapping clips
-
-DURATION ENFORCEMENT (CRITICAL):
-⚠️ REJECT any clip <25 seconds - it's incomplete by definition
-⚠️ REJECT any clip >65 seconds - it's too long for short-form platforms
-⚠️ If a moment seems viral but is <25s, EXPAND to capture more context
-⚠️ If a moment is >65s, either SPLIT into multiple clips OR TRIM to capture the core moment
-⚠️ MANDATORY: Calculate end_time - start_time and verify it's between 25-65 BEFORE including in output
-
-GUARDRAILS:
-- NEVER cut mid-sentence
-- NEVER omit punchline/conclusion
-- NEVER create clips requiring prior knowledge
-- NEVER accept clips outside 25-65s duration range
-- ALWAYS verify natural speaking rhythm preserved
-- ALWAYS extend short clips to capture complete context"""
+    @staticmethod
+    def _iou(a: ViralMoment, b: ViralMoment) -> float:
+        """Intersection-over-union of two moments' time ranges."""
+        intersection = min(a.end_time, b.end_time) - max(a.start_time, b.start_time)
+        if intersection <= 0:
+            return 0.0
+        union = max(a.end_time, b.end_time) - min(a.start_time, b.start_time)
+        return intersection / union
+    
+    def _format_transcript(self, segments: Transcript) -> str:
+        """Format transcript with timestamps for analysis (lines are pre-formatted at transcription)."""
+        return "\n".join(segments.lines)
+    
+    def _create_analysis_prompt(self, transcript: str, video_info: Dict) -> str:
+        """Create the per-request user message; the static CLEAR instructions live in _CLEAR_SYSTEM_PROMPT."""
+        return (
+            f"Video: {video_info.get('title', 'Unknown')}\n"
+            f"Channel: {video_info.get('channel', 'Unknown')}\n"
+            f"Duration: {video_info.get('duration', 0)} seconds\n\n"
+            f"{transcript}"
+        )
     
-    def _parse_viral_moments(self, analysis: Dict, segments: List[TranscriptSegment]) -> List[ViralMoment]:
+    def _parse_viral_moments(self, analysis: Dict, segments: Transcript) -> List[ViralMoment]:
         """Parse AI analysis into ViralMoment objects with duration validation."""
         moments = []
-        MIN_DURATION = 25  # seconds
-        MAX_DURATION = 65  # seconds
+        MIN_DURATION = self.MIN_DURATION
+        MAX_DURATION = self.MAX_DURATION
 
         for moment_data in analysis.get("viral_moments", []):
             # Find relevant transcript text
@@ -368,10 +936,9 @@ GUARDRAILS:
                 logger.warning(f"Skipping clip with invalid duration: {duration:.1f}s (must be {MIN_DURATION}-{MAX_DURATION}s)")
                 continue
 
-            relevant_text = " ".join([
-                seg.text for seg in segments
-                if seg.start <= end and seg.end >= start
-            ])
+            # Overlapping segments via one vectorized boolean mask over the timing arrays
+            mask = (segments.starts <= end) & (segments.ends >= start)
+            relevant_text = " ".join(segments.texts[i] for i in np.flatnonzero(mask))
 
             moment = ViralMoment(
                 start_time=start,
@@ -391,40 +958,91 @@ GUARDRAILS:
 class ViralityDetector:
     """Main orchestrator for the virality detection pipeline."""
 
-    def __init__(self, openai_api_key: str, whisper_model: str = "base"):
+    def __init__(self, openai_api_key: str, whisper_model: str = "base", local_transcription: bool = False):
+        """
+        Args:
+            openai_api_key: OpenAI API key
+            whisper_model: Local faster-whisper model size
+            local_transcription: Skip the Whisper API and stream audio from YouTube
+                directly into the local model, without an intermediate audio file
+        """
         self.downloader = YouTubeDownloader()
         self.transcriber = WhisperTranscriber(openai_api_key, whisper_model)
         self.analyzer = ViralityAnalyzer(openai_api_key)
+        self.local_transcription = local_transcription
         
-    def process_video(self, url: str) -> Dict:
+    def process_video(self, url: str, include_transcript: bool = False) -> Dict:
         """
         Process a YouTube video end-to-end.
         
         Args:
             url: YouTube video URL
+            include_transcript: Include the full timestamped transcript in the results
             
+        Returns:
+            Dictionary containing full results
+        """
+        async def run() -> Dict:
+            try:
+                return await self.process_video_async(url, include_transcript)
+            finally:
+                # This loop ends with asyncio.run: close its async clients, and the
+                # sync ones too since a one-shot call has nothing left to share them with
+                await close_openai_clients()
+
+        return asyncio.run(run())
+
+    async def process_video_async(self, url: str, include_transcript: bool = False) -> Dict:
+        """
+        Process a YouTube video end-to-end without blocking the event loop.
+
+        Download and the Whisper API call run in worker threads; local
+        transcription goes through the shared TranscribeScheduler, and the
+        OpenAI analysis call is awaited directly.
+
+        Args:
+            url: YouTube video URL
+            include_transcript: Include the full timestamped transcript in the results
+
         Returns:
             Dictionary containing full results
         """
         try:
-            # Step 1: Download audio
-            logger.info("Step 1/4: Downloading audio...")
-            audio_path, video_info = self.downloader.download_audio(url)
-            
-            # Step 2: Transcribe
-            logger.info("Step 2/4: Transcribing audio...")
-            segments = self.transcriber.transcribe(audio_path)
+            audio_path = None
+            if self.local_transcription:
+                # Steps 1-2: Stream audio into memory and transcribe locally
+                logger.info("Step 1/4: Streaming audio...")
+                try:
+                    audio, video_info = await asyncio.to_thread(self.downloader.stream_audio, url)
+                except Exception as e:
+                    # Fall back to a regular download, still transcribed locally
+                    logger.warning(f"Audio streaming failed: {e}, downloading instead")
+                    audio, video_info = await asyncio.to_thread(self.downloader.download_audio, url)
+                    audio_path = audio
+
+                logger.info("Step 2/4: Transcribing audio...")
+                segments = await self.transcriber.transcribe_local_async(audio)
+                del audio
+            else:
+                # Step 1: Download audio
+                logger.info("Step 1/4: Downloading audio...")
+                audio_path, video_info = await asyncio.to_thread(self.downloader.download_audio, url)
+
+                # Step 2: Transcribe
+                logger.info("Step 2/4: Transcribing audio...")
+                segments = await self.transcriber.transcribe_async(audio_path)
             
             # Step 3: Analyze for virality
             logger.info("Step 3/4: Analyzing for viral moments...")
-            viral_moments = self.analyzer.analyze(segments, video_info)
+            viral_moments = await self.analyzer.analyze(segments, video_info)
             
             # Step 4: Format results
             logger.info("Step 4/4: Formatting results...")
-            results = self._format_results(video_info, segments, viral_moments)
+            results = self._format_results(video_info, segments, viral_moments, include_transcript)
             
             # Cleanup
-            audio_path.unlink()
+            if audio_path is not None:
+                audio_path.unlink()
             
             return results
             
@@ -432,10 +1050,10 @@ class ViralityDetector:
             logger.error(f"Processing failed: {e}")
             raise
     
-    def _format_results(self, video_info: Dict, segments: List[TranscriptSegment], 
-                       viral_moments: List[ViralMoment]) -> Dict:
+    def _format_results(self, video_info: Dict, segments: Transcript, 
+                       viral_moments: List[ViralMoment], include_transcript: bool = False) -> Dict:
         """Format all results into a structured dictionary."""
-        return {
+        results = {
             "video": {
                 "title": video_info.get("title"),
                 "url": video_info.get("webpage_url"),
@@ -456,16 +1074,21 @@ class ViralityDetector:
                 }
                 for i, moment in enumerate(viral_moments)
             ],
-            "full_transcript": [
+        }
+
+        # Only build the per-segment list when a caller actually wants it
+        if include_transcript:
+            results["full_transcript"] = [
                 {
-                    "timestamp": segment.to_timestamp(),
-                    "start": segment.start,
-                    "end": segment.end,
-                    "text": segment.text
+                    "timestamp": f"{_format_whole_seconds(int(start))} - {_format_whole_seconds(int(end))}",
+                    "start": start,
+                    "end": end,
+                    "text": text
                 }
-                for segment in segments
+                for start, end, text in zip(segments.starts.tolist(), segments.ends.tolist(), segments.texts)
             ]
-        }
+
+        return results
 
 
 def main():
@@ -479,6 +1102,8 @@ def main():
     parser.add_argument("--output", "-o", help="Output file path (JSON)")
     parser.add_argument("--no-transcript", action="store_true", 
                        help="Exclude full transcript from output")
+    parser.add_argument("--local-whisper", action="store_true",
+                       help="Transcribe locally, streaming audio from YouTube without a temp file")
     
     args = parser.parse_args()
     
@@ -486,17 +1111,13 @@ def main():
     os.environ["OPENAI_API_KEY"] = args.api_key
     
     # Process video
-    detector = ViralityDetector(args.api_key, args.whisper_model)
-    results = detector.process_video(args.url)
-    
-    # Remove transcript if requested
-    if args.no_transcript:
-        del results["full_transcript"]
+    detector = ViralityDetector(args.api_key, args.whisper_model, local_transcription=args.local_whisper)
+    results = detector.process_video(args.url, include_transcript=not args.no_transcript)
     
     # Output results
     if args.output:
-        with open(args.output, "w") as f:
-            json.dump(results, f, indent=2)
+        with open(args.output, "wb") as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
         logger.info(f"Results saved to: {args.output}")
     else:
         # Print to console